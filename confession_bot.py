@@ -1,13 +1,17 @@
 import os
+import re
 import sys
+import asyncio
 import sqlite3
 import logging
 import threading
 import time
+import functools
 import requests # Added for internal keep-alive ping
 from datetime import datetime
 from flask import Flask, jsonify # Added jsonify for health check
 from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
+from telegram.error import BadRequest, RetryAfter, TimedOut
 from telegram.ext import (
     Application, 
     CommandHandler, 
@@ -15,7 +19,8 @@ from telegram.ext import (
     MessageHandler, 
     filters, 
     ContextTypes, 
-    ConversationHandler
+    ConversationHandler,
+    BaseUpdateProcessor
 )
 
 # Load environment variables
@@ -25,7 +30,12 @@ load_dotenv()
 # --- Configuration & Validation ---
 BOT_TOKEN = os.getenv("BOT_TOKEN")
 ADMIN_CHAT_ID_RAW = os.getenv("ADMIN_CHAT_ID", "")
-ADMIN_CHAT_IDS = [id.strip() for id in ADMIN_CHAT_ID_RAW.split(',') if id.strip()] if ADMIN_CHAT_ID_RAW else []
+# Parsed once into integer ids: admin checks are a set lookup and sends need no conversion
+try:
+    ADMIN_CHAT_IDS = frozenset(int(id) for id in ADMIN_CHAT_ID_RAW.split(',') if id.strip())
+except ValueError:
+    print("❌ ERROR: ADMIN_CHAT_ID must be a comma-separated list of numeric Telegram IDs")
+    sys.exit(1)
 CHANNEL_ID = os.getenv("CHANNEL_ID")
 BOT_USERNAME = os.getenv("BOT_USERNAME")
 FLASK_PORT = int(os.environ.get('PORT', 5000)) # Get port from environment or default
@@ -36,6 +46,8 @@ if not all([BOT_TOKEN, ADMIN_CHAT_IDS, CHANNEL_ID, BOT_USERNAME]):
     sys.exit(1)
 
 BOT_USERNAME = BOT_USERNAME.replace('@', '').strip()
+# Channel posts link back here with /start discuss_<id> (parsed by DEEP_LINK_PATTERN)
+DEEP_LINK_PREFIX = f"https://t.me/{BOT_USERNAME}?start=discuss_"
 
 # --- Logging Setup ---
 logging.basicConfig(
@@ -65,9 +77,91 @@ HELP_TEXT = """
 5. Add comments to discuss confessions
 """
 
+DATABASE_PATH = 'confessions.db'
+# Confession rows kept in memory by DatabaseManager.get_confession
+CONFESSION_CACHE_SIZE = 2048
+# Prepared statements kept per connection by the sqlite3 module
+SQL_STATEMENT_CACHE_SIZE = 256
+# Approved confessions fetched per browse page; the next page loads when the user reaches the end
+BROWSE_PAGE_SIZE = 20
+# Seconds a category's first browse page is shared between users before it is re-queried
+BROWSE_CACHE_TTL = 30
+# Most confession ids a browse session keeps; older pages are dropped and re-fetched on Previous
+BROWSE_WINDOW_SIZE = 10 * BROWSE_PAGE_SIZE
+# Seconds a fetched comment thread is reused by view_comments, and how many threads are kept
+COMMENTS_CACHE_TTL = 15
+COMMENTS_CACHE_SIZE = 1024
+# Browse rows kept in memory for all users; user_data holds only the ids
+BROWSE_ROW_CACHE_SIZE = 2048
+# Minimum seconds between message edits in one chat (Telegram's per-chat soft limit),
+# and how many chats' edit schedules are remembered
+EDIT_MIN_INTERVAL = 1.0
+EDIT_LIMITER_SIZE = 4096
+# Surrounding whitespace tolerated before an over-length message is rejected unstripped
+LENGTH_CHECK_WHITESPACE_SLACK = 64
+
+# Seconds between batched channel-post comment-count refreshes
+CHANNEL_REFRESH_INTERVAL = 3
+# Updates handled at once across all chats; each chat still sees its updates in order
+MAX_CONCURRENT_UPDATES = 32
+# Updates PTB may hand to the processor at once, including those queued behind their
+# own chat; only MAX_CONCURRENT_UPDATES of them run handlers at a time
+MAX_PENDING_UPDATES = 1024
+# Seconds Telegram may hold each getUpdates long-poll open when there is nothing new
+POLLING_TIMEOUT = 30
+# Bot API HTTP client timeouts. The connection pool keeps PTB's default of 256, which
+# covers MAX_CONCURRENT_UPDATES handlers plus their background query answers, deferred
+# edits and the channel refresh loop.
+TELEGRAM_POOL_TIMEOUT = 10.0
+TELEGRAM_CONNECT_TIMEOUT = 5.0
+TELEGRAM_READ_TIMEOUT = 10.0
+
+# Admin review message shell; only the per-confession fields are filled in per submission
+ADMIN_REVIEW_TEMPLATE = (
+    "🆕 *New Confession Pending Review* #{confession_id}\n\n"
+    "👤 *User:* {username} (ID: {user_id})\n"
+    "📂 *Category:* {category}\n"
+    "📝 *Confession:* {text}\n\n"
+    "*Please review this confession:*"
+)
+
+# Public channel post shell, filled in by format_channel_post
+CHANNEL_POST_TEMPLATE = (
+    "*Confession #{confession_id}*\n\n"
+    "{text}\n\n"
+    "*Category:* {category}\n"
+    "*Comments:* 💬 {comments_count}\n\n"
+    "_Click below to join the discussion!_ 👇"
+)
+
 # Conversation States
 SELECTING_CATEGORY, WRITING_CONFESSION, BROWSING_CONFESSIONS, WRITING_COMMENT = range(4)
 
+# user_data keys owned by each flow. Leaving a flow drops only its own keys, so the
+# browse window and render signature survive a detour through confessing or commenting.
+CONFESSION_STATE_KEYS = ('db_category',)
+COMMENT_STATE_KEYS = ('comment_confession_id', 'comment_confession_category')
+
+# Callback-data patterns, compiled once and shared by every handler registration.
+# Handlers read ids from the capture groups via context.match instead of re-splitting query.data.
+# Ids are capped at 18 digits so a forged callback can never overflow SQLite's 64-bit INTEGER.
+# Callback data is plain ASCII, so re.ASCII keeps \d and \w from consulting Unicode tables.
+START_CONFESS_PATTERN = re.compile(r"^start_confess$", re.ASCII)
+CATEGORY_PATTERN = re.compile(r"^cat_(\w+)$", re.ASCII)
+CANCEL_CONFESS_PATTERN = re.compile(r"^cancel_confess$", re.ASCII)
+MAIN_MENU_PATTERN = re.compile(r"^main_menu$", re.ASCII)
+BROWSE_MENU_PATTERN = re.compile(r"^browse_menu$", re.ASCII)
+# browse_menu shares the prefix but opens the category picker, so it is excluded here
+BROWSE_CATEGORY_PATTERN = re.compile(r"^browse_(?!menu$)(\w+)$", re.ASCII)
+NAVIGATION_PATTERN = re.compile(r"^(next|prev)$", re.ASCII)
+ADD_COMMENT_PATTERN = re.compile(r"^add_comment_(\d{1,18})$", re.ASCII)
+VIEW_COMMENTS_PATTERN = re.compile(r"^view_comments_(\d{1,18})$", re.ASCII)
+BACK_TO_CONFESSION_PATTERN = re.compile(r"^back_to_confession_(\d{1,18})$", re.ASCII)
+HELP_INFO_PATTERN = re.compile(r"^help_info$", re.ASCII)
+ADMIN_ACTION_PATTERN = re.compile(r"^(approve|reject)_(\d{1,18})$", re.ASCII)
+# /start payload of the channel post's "join the discussion" link
+DEEP_LINK_PATTERN = re.compile(r"^discuss_(\d{1,18})$", re.ASCII)
+
 CATEGORY_MAP = {
     "relationship": "💔 Love & Relationships", 
     "friendship": "👥 Friendship", 
@@ -77,8 +171,22 @@ CATEGORY_MAP = {
     "secret": "😔 Regrets",
     "recent": "📚 Latest Confessions" # For browsing category names
 }
-# Reverse map for database storage
-REVERSE_CATEGORY_MAP = {v: k for k, v in CATEGORY_MAP.items()}
+# Display name for category keys missing from CATEGORY_MAP
+DEFAULT_CATEGORY_NAME = CATEGORY_MAP["general"]
+
+# Writing prompt shown after a category is picked, prebuilt per category key
+_CATEGORY_PROMPTS = {
+    key: (
+        f"✅ *Category Selected:* {name}\n\n"
+        "📝 *Now write your confession:*\n\n"
+        "Please type your confession below:\n"
+        "• 10-1000 characters\n"
+        "• Be respectful\n"
+        "• No personal information\n\n"
+        "Your confession will be reviewed by admins before posting."
+    )
+    for key, name in CATEGORY_MAP.items()
+}
 
 # --- Enhanced Flask App for 24/7 Health Checks ---
 app = Flask(__name__)
@@ -131,27 +239,101 @@ def keep_alive_ping():
         try:
             response = requests.get(f"{base_url}/health", timeout=10)
             if response.status_code == 200:
-                logger.info(f"✅ Keep-alive ping successful at {datetime.now().strftime('%H:%M:%S')}")
+                logger.info("✅ Keep-alive ping successful at %s", datetime.now().strftime('%H:%M:%S'))
             else:
-                logger.warning(f"⚠️ Keep-alive ping failed: {response.status_code}")
+                logger.warning("⚠️ Keep-alive ping failed: %s", response.status_code)
         except Exception as e:
-            logger.error(f"❌ Keep-alive ping error: {e}")
+            logger.error("❌ Keep-alive ping error: %s", e)
             
         # Ping every 5 minutes (300 seconds) to stay alive
         time.sleep(300)
 
 # --- Database Management ---
+# Query text lives in module constants so every call hands sqlite3 the identical
+# string and hits the connection's prepared-statement cache.
+SQL_INSERT_CONFESSION = 'INSERT INTO confessions (user_id, username, category, confession_text) VALUES (?, ?, ?, ?)'
+SQL_UPDATE_STATUS = 'UPDATE confessions SET status = ? WHERE id = ?'
+SQL_UPDATE_STATUS_AND_MESSAGE = 'UPDATE confessions SET status = ?, channel_message_id = ? WHERE id = ?'
+SQL_APPROVE_AND_LINK = "UPDATE confessions SET status = 'approved', channel_message_id = ? WHERE id = ? AND status = 'pending'"
+SQL_REJECT_PENDING = "UPDATE confessions SET status = 'rejected' WHERE id = ? AND status = 'pending'"
+SQL_GET_CONFESSION = (
+    "SELECT id, user_id, username, category, confession_text, timestamp, status, "
+    "channel_message_id, comments_count FROM confessions WHERE id = ?"
+)
+# Approved rows carry their denormalized comment count, so browsing runs no COUNT query.
+# Timestamps come back as epoch seconds so formatting them needs no string parsing.
+# Pages are keyset-paginated: each page seeks below the last id of the previous one.
+SQL_APPROVED_BY_CATEGORY = (
+    "SELECT c.id, c.confession_text, c.category, CAST(strftime('%s', c.timestamp) AS INTEGER), "
+    "c.comments_count "
+    "FROM confessions c WHERE c.status = 'approved' AND c.category = ? AND c.id < ? ORDER BY c.id DESC LIMIT ?"
+)
+SQL_APPROVED_ALL = (
+    "SELECT c.id, c.confession_text, c.category, CAST(strftime('%s', c.timestamp) AS INTEGER), "
+    "c.comments_count "
+    "FROM confessions c WHERE c.status = 'approved' AND c.id < ? ORDER BY c.id DESC LIMIT ?"
+)
+SQL_APPROVED_BY_ID = (
+    "SELECT c.id, c.confession_text, c.category, CAST(strftime('%s', c.timestamp) AS INTEGER), "
+    "c.comments_count "
+    "FROM confessions c WHERE c.status = 'approved' AND c.id = ?"
+)
+# Stepping back before a browse window's first id seeks upwards, oldest-first
+SQL_APPROVED_BY_CATEGORY_NEWER = (
+    "SELECT c.id, c.confession_text, c.category, CAST(strftime('%s', c.timestamp) AS INTEGER), "
+    "c.comments_count "
+    "FROM confessions c WHERE c.status = 'approved' AND c.category = ? AND c.id > ? ORDER BY c.id ASC LIMIT ?"
+)
+SQL_APPROVED_ALL_NEWER = (
+    "SELECT c.id, c.confession_text, c.category, CAST(strftime('%s', c.timestamp) AS INTEGER), "
+    "c.comments_count "
+    "FROM confessions c WHERE c.status = 'approved' AND c.id > ? ORDER BY c.id ASC LIMIT ?"
+)
+# Upper bound for the first page's keyset cursor (largest SQLite INTEGER)
+SQL_MAX_ID = 2**63 - 1
+# Comments are shown anonymously, so no display name is stored with them
+SQL_INSERT_COMMENT = 'INSERT INTO comments (confession_id, user_id, comment_text) VALUES (?, ?, ?)'
+SQL_GET_COMMENTS = (
+    "SELECT comment_text, CAST(strftime('%s', timestamp) AS INTEGER) "
+    "FROM comments WHERE confession_id = ? ORDER BY timestamp ASC"
+)
+SQL_COUNT_COMMENTS = 'SELECT comments_count FROM confessions WHERE id = ?'
+SQL_INCREMENT_COMMENTS_COUNT = 'UPDATE confessions SET comments_count = comments_count + 1 WHERE id = ?'
+SQL_BACKFILL_COMMENTS_COUNT = (
+    "UPDATE confessions SET comments_count = "
+    "(SELECT COUNT(*) FROM comments m WHERE m.confession_id = confessions.id)"
+)
+
 class DatabaseManager:
     def __init__(self):
+        # One long-lived connection keeps SQLite's page and schema caches warm
+        # between handlers. check_same_thread=False is essential for multi-threaded
+        # bots; the lock serializes access since the connection is shared. The statement
+        # cache is sized above the number of SQL_* constants so none of them is re-prepared.
+        self.conn = sqlite3.connect(
+            DATABASE_PATH,
+            check_same_thread=False,
+            isolation_level=None,
+            cached_statements=SQL_STATEMENT_CACHE_SIZE
+        )
+        self.lock = threading.Lock()
+        # confession_id -> full confession row; every status change goes through this
+        # class and drops the entry, so cached rows never show a stale status
+        self._confession_cache = {}
         self.init_database()
     
     def init_database(self):
-        conn = None
         try:
-            # check_same_thread=False is essential for multi-threaded bots
-            conn = sqlite3.connect('confessions.db', check_same_thread=False) 
-            cursor = conn.cursor()
-            
+            cursor = self.conn.cursor()
+
+            # WAL lets browse reads run alongside approval/comment writes, and
+            # memory-mapped I/O serves reads from the OS page cache
+            cursor.execute('PRAGMA journal_mode=WAL')
+            cursor.execute('PRAGMA synchronous=NORMAL')
+            cursor.execute('PRAGMA mmap_size=268435456')
+            cursor.execute('PRAGMA temp_store=MEMORY')
+            cursor.execute('PRAGMA cache_size=-20000')
+
             # Confessions table
             cursor.execute('''
                 CREATE TABLE IF NOT EXISTS confessions (
@@ -162,9 +344,16 @@ class DatabaseManager:
                     confession_text TEXT,
                     timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
                     status TEXT DEFAULT 'pending',
-                    channel_message_id INTEGER
+                    channel_message_id INTEGER,
+                    comments_count INTEGER DEFAULT 0
                 )
             ''')
+
+            # Databases created before comments_count existed get the column and a one-off backfill
+            columns = {row[1] for row in cursor.execute('PRAGMA table_info(confessions)')}
+            if 'comments_count' not in columns:
+                cursor.execute('ALTER TABLE confessions ADD COLUMN comments_count INTEGER DEFAULT 0')
+                cursor.execute(SQL_BACKFILL_COMMENTS_COUNT)
             
             # Comments table
             cursor.execute('''
@@ -178,121 +367,162 @@ class DatabaseManager:
                     FOREIGN KEY (confession_id) REFERENCES confessions(id)
                 )
             ''')
-            
-            conn.commit()
+
+            # Status + id index so "approved, newest first" lookups are an index range seek
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_conf_status_id ON confessions(status, id)')
+            # Category browsing seeks straight to (status, category) and walks ids newest first
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_conf_status_cat_id ON confessions(status, category, id)')
+            # Time-ordered comment lists per confession (and the count backfill)
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_comments_confession_ts ON comments(confession_id, timestamp)')
+            # Refresh planner statistics so the new indexes are picked up
+            cursor.execute('ANALYZE')
+
             print("✅ Database initialized successfully")
         except Exception as e:
-            logger.error(f"❌ Database initialization error: {e}")
-        finally:
-            if conn:
-                conn.close()
+            logger.error("❌ Database initialization error: %s", e)
 
     # --- CRUD Methods (Abbreviated to keep file shorter) ---
     # (Your original CRUD methods: save_confession, update_confession_status, 
     # get_confession, get_approved_confessions, save_comment, get_comments, get_comments_count)
     
     def save_confession(self, user_id, username, category, confession_text):
-        conn = sqlite3.connect('confessions.db', check_same_thread=False)
-        cursor = conn.cursor()
-        cursor.execute('INSERT INTO confessions (user_id, username, category, confession_text) VALUES (?, ?, ?, ?)', (user_id, username, category, confession_text))
-        confession_id = cursor.lastrowid
-        conn.commit()
-        conn.close()
-        return confession_id
+        with self.lock:
+            cursor = self.conn.execute(SQL_INSERT_CONFESSION, (user_id, username, category, confession_text))
+            return cursor.lastrowid
 
     def update_confession_status(self, confession_id, status, channel_message_id=None):
-        conn = sqlite3.connect('confessions.db', check_same_thread=False)
-        cursor = conn.cursor()
-        if channel_message_id is not None:
-            cursor.execute('UPDATE confessions SET status = ?, channel_message_id = ? WHERE id = ?', (status, channel_message_id, confession_id))
-        else:
-            cursor.execute('UPDATE confessions SET status = ? WHERE id = ?', (status, confession_id))
-        conn.commit()
-        conn.close()
+        with self.lock:
+            if channel_message_id is not None:
+                self.conn.execute(SQL_UPDATE_STATUS_AND_MESSAGE, (status, channel_message_id, confession_id))
+            else:
+                self.conn.execute(SQL_UPDATE_STATUS, (status, confession_id))
+            self._confession_cache.pop(confession_id, None)
+
+    def approve_and_link(self, confession_id, channel_message_id):
+        """Approve a still-pending confession and link its channel post; False if it was already processed."""
+        with self.lock:
+            cursor = self.conn.execute(SQL_APPROVE_AND_LINK, (channel_message_id, confession_id))
+            self._confession_cache.pop(confession_id, None)
+            return cursor.rowcount == 1
+
+    def reject_pending(self, confession_id):
+        """Reject a still-pending confession; False if it was already processed."""
+        with self.lock:
+            cursor = self.conn.execute(SQL_REJECT_PENDING, (confession_id,))
+            self._confession_cache.pop(confession_id, None)
+            return cursor.rowcount == 1
 
     def get_confession(self, confession_id):
-        conn = sqlite3.connect('confessions.db', check_same_thread=False)
-        cursor = conn.cursor()
-        cursor.execute('SELECT * FROM confessions WHERE id = ?', (confession_id,))
-        result = cursor.fetchone()
-        conn.close()
-        return result
-    
-    def get_approved_confessions(self, category=None, limit=50):
-        conn = sqlite3.connect('confessions.db', check_same_thread=False)
-        cursor = conn.cursor()
-        if category and category != "recent":
-            cursor.execute('SELECT id, confession_text, category, timestamp FROM confessions WHERE status = "approved" AND category = ? ORDER BY id DESC LIMIT ?', (category, limit))
-        else:
-            cursor.execute('SELECT id, confession_text, category, timestamp FROM confessions WHERE status = "approved" ORDER BY id DESC LIMIT ?', (limit,))
-        result = cursor.fetchall()
-        conn.close()
-        return result
-
-    def save_comment(self, confession_id, user_id, username, comment_text):
-        conn = sqlite3.connect('confessions.db', check_same_thread=False)
-        cursor = conn.cursor()
-        cursor.execute('INSERT INTO comments (confession_id, user_id, username, comment_text) VALUES (?, ?, ?, ?)', (confession_id, user_id, username, comment_text))
-        comment_id = cursor.lastrowid
-        conn.commit()
-        conn.close()
-        return comment_id
+        with self.lock:
+            confession = self._confession_cache.get(confession_id)
+            if confession is None:
+                # Rows come back as sqlite3.Row so callers read columns by name
+                cursor = self.conn.cursor()
+                cursor.row_factory = sqlite3.Row
+                confession = cursor.execute(SQL_GET_CONFESSION, (confession_id,)).fetchone()
+                if confession is None:
+                    return None
+                if len(self._confession_cache) >= CONFESSION_CACHE_SIZE:
+                    # Evict the oldest entry (dicts keep insertion order)
+                    del self._confession_cache[next(iter(self._confession_cache))]
+                self._confession_cache[confession_id] = confession
+            return confession
+    
+    def get_approved_confessions(self, category=None, before_id=None, limit=BROWSE_PAGE_SIZE):
+        if before_id is None:
+            before_id = SQL_MAX_ID
+        with self.lock:
+            if category and category != "recent":
+                cursor = self.conn.execute(SQL_APPROVED_BY_CATEGORY, (category, before_id, limit))
+            else:
+                cursor = self.conn.execute(SQL_APPROVED_ALL, (before_id, limit))
+            return cursor.fetchall()
+
+    def get_newer_approved_confessions(self, category=None, after_id=0, limit=BROWSE_PAGE_SIZE):
+        """The page of approved confessions just above after_id, newest first like the other pages."""
+        with self.lock:
+            if category and category != "recent":
+                cursor = self.conn.execute(SQL_APPROVED_BY_CATEGORY_NEWER, (category, after_id, limit))
+            else:
+                cursor = self.conn.execute(SQL_APPROVED_ALL_NEWER, (after_id, limit))
+            rows = cursor.fetchall()
+        rows.reverse()
+        return rows
+
+    def get_approved_confession(self, confession_id):
+        """Single approved confession in the same row shape as get_approved_confessions."""
+        with self.lock:
+            return self.conn.execute(SQL_APPROVED_BY_ID, (confession_id,)).fetchone()
+
+    def save_comment(self, confession_id, user_id, comment_text):
+        """Store a comment and return its confession's new comment count."""
+        with self.lock:
+            # The comment and its confession's count are written in one transaction
+            self.conn.execute('BEGIN')
+            try:
+                self.conn.execute(SQL_INSERT_COMMENT, (confession_id, user_id, comment_text))
+                self.conn.execute(SQL_INCREMENT_COMMENTS_COUNT, (confession_id,))
+                row = self.conn.execute(SQL_COUNT_COMMENTS, (confession_id,)).fetchone()
+                self.conn.execute('COMMIT')
+            except Exception:
+                self.conn.execute('ROLLBACK')
+                raise
+            self._confession_cache.pop(confession_id, None)
+            return row[0] if row else 0
 
     def get_comments(self, confession_id):
-        conn = sqlite3.connect('confessions.db', check_same_thread=False)
-        cursor = conn.cursor()
-        cursor.execute('SELECT username, comment_text, timestamp FROM comments WHERE confession_id = ? ORDER BY timestamp ASC', (confession_id,))
-        result = cursor.fetchall()
-        conn.close()
-        return result
+        with self.lock:
+            return self.conn.execute(SQL_GET_COMMENTS, (confession_id,)).fetchall()
 
     def get_comments_count(self, confession_id):
-        conn = sqlite3.connect('confessions.db', check_same_thread=False)
-        cursor = conn.cursor()
-        cursor.execute('SELECT COUNT(*) FROM comments WHERE confession_id = ?', (confession_id,))
-        count = cursor.fetchone()[0]
-        conn.close()
-        return count
+        # The count lives on the confession row, so the row cache serves it
+        confession = self.get_confession(confession_id)
+        return confession['comments_count'] if confession else 0
     
 # Initialize database
 db = DatabaseManager()
 
 # --- Keyboard Functions (Your original functions, assumed correct) ---
 
+# Static keyboards are built once at import; PTB markups are immutable, so every
+# handler can safely share the same instance.
+_MAIN_KEYBOARD = InlineKeyboardMarkup([
+    [InlineKeyboardButton("💌 Submit Confession", callback_data="start_confess")],
+    [InlineKeyboardButton("📖 Browse Confessions", callback_data="browse_menu")],
+    [InlineKeyboardButton("❓ Help & Guidelines", callback_data="help_info")]
+])
+
+_CATEGORY_KEYBOARD = InlineKeyboardMarkup([
+    [InlineKeyboardButton("💔 Love & Relationships", callback_data="cat_relationship")],
+    [InlineKeyboardButton("👥 Friendship", callback_data="cat_friendship")],
+    [InlineKeyboardButton("📚 Academic Stress", callback_data="cat_campus")],
+    [InlineKeyboardButton("😨 Fear & Anxiety", callback_data="cat_vent")],
+    [InlineKeyboardButton("😔 Regrets", callback_data="cat_secret")],
+    [InlineKeyboardButton("🌟 Other", callback_data="cat_general")],
+    [InlineKeyboardButton("❌ Cancel", callback_data="cancel_confess")]
+])
+
+_BROWSE_KEYBOARD = InlineKeyboardMarkup([
+    [InlineKeyboardButton("📚 Latest Confessions", callback_data="browse_recent")],
+    [InlineKeyboardButton("💔 Love & Relationships", callback_data="browse_relationship")],
+    [InlineKeyboardButton("👥 Friendship", callback_data="browse_friendship")],
+    [InlineKeyboardButton("📚 Academic Stress", callback_data="browse_campus")],
+    [InlineKeyboardButton("😨 Fear & Anxiety", callback_data="browse_vent")],
+    [InlineKeyboardButton("😔 Regrets", callback_data="browse_secret")],
+    [InlineKeyboardButton("🌟 Other", callback_data="browse_general")],
+    [InlineKeyboardButton("🏠 Main Menu", callback_data="main_menu")]
+])
+
 def get_main_keyboard():
-    buttons = [
-        [InlineKeyboardButton("💌 Submit Confession", callback_data="start_confess")],
-        [InlineKeyboardButton("📖 Browse Confessions", callback_data="browse_menu")],
-        [InlineKeyboardButton("❓ Help & Guidelines", callback_data="help_info")]
-    ]
-    return InlineKeyboardMarkup(buttons)
+    return _MAIN_KEYBOARD
 
 def get_category_keyboard():
-    return InlineKeyboardMarkup([
-        [InlineKeyboardButton("💔 Love & Relationships", callback_data="cat_relationship")],
-        [InlineKeyboardButton("👥 Friendship", callback_data="cat_friendship")],
-        [InlineKeyboardButton("📚 Academic Stress", callback_data="cat_campus")],
-        [InlineKeyboardButton("😨 Fear & Anxiety", callback_data="cat_vent")],
-        [InlineKeyboardButton("😔 Regrets", callback_data="cat_secret")],
-        [InlineKeyboardButton("🌟 Other", callback_data="cat_general")],
-        [InlineKeyboardButton("❌ Cancel", callback_data="cancel_confess")]
-    ])
+    return _CATEGORY_KEYBOARD
 
 def get_browse_keyboard():
-    buttons = [
-        [InlineKeyboardButton("📚 Latest Confessions", callback_data="browse_recent")],
-        [InlineKeyboardButton("💔 Love & Relationships", callback_data="browse_relationship")],
-        [InlineKeyboardButton("👥 Friendship", callback_data="browse_friendship")],
-        [InlineKeyboardButton("📚 Academic Stress", callback_data="browse_campus")],
-        [InlineKeyboardButton("😨 Fear & Anxiety", callback_data="browse_vent")],
-        [InlineKeyboardButton("😔 Regrets", callback_data="browse_secret")],
-        [InlineKeyboardButton("🌟 Other", callback_data="browse_general")],
-        [InlineKeyboardButton("🏠 Main Menu", callback_data="main_menu")]
-    ]
-    return InlineKeyboardMarkup(buttons)
+    return _BROWSE_KEYBOARD
 
-def get_confession_discussion_keyboard(confession_id):
-    comments_count = db.get_comments_count(confession_id)
+def get_confession_discussion_keyboard(confession_id, comments_count):
     return InlineKeyboardMarkup([
         [
             InlineKeyboardButton(f"💬 Add Comment ({comments_count})", callback_data=f"add_comment_{confession_id}"),
@@ -302,16 +532,15 @@ def get_confession_discussion_keyboard(confession_id):
         [InlineKeyboardButton("🏠 Main Menu", callback_data="main_menu")]
     ])
 
-def get_confession_browse_keyboard(confession_id, total, index):
-    comments_count = db.get_comments_count(confession_id)
-    buttons = []
-    
+# Paging back and forth re-renders the same few confessions, so their markups are memoized
+@functools.lru_cache(maxsize=4096)
+def get_confession_browse_keyboard(confession_id, has_prev, has_next, comments_count):
     # Navigation buttons
     nav_row = []
-    if index > 1:
-        nav_row.append(InlineKeyboardButton("⬅️ Previous", callback_data=f"prev_{confession_id}"))
-    if index < total:
-        nav_row.append(InlineKeyboardButton("Next ➡️", callback_data=f"next_{confession_id}"))
+    if has_prev:
+        nav_row.append(InlineKeyboardButton("⬅️ Previous", callback_data="prev"))
+    if has_next:
+        nav_row.append(InlineKeyboardButton("Next ➡️", callback_data="next"))
     
     # Action buttons with comment count
     action_buttons = [
@@ -338,8 +567,7 @@ def get_admin_keyboard(confession_id):
         ]
     ])
 
-def get_comments_management_keyboard(confession_id):
-    comments_count = db.get_comments_count(confession_id)
+def get_comments_management_keyboard(confession_id, comments_count):
     return InlineKeyboardMarkup([
         [InlineKeyboardButton(f"💬 Add Comment ({comments_count})", callback_data=f"add_comment_{confession_id}")],
         [InlineKeyboardButton("⬅️ Back to Confession", callback_data=f"back_to_confession_{confession_id}")],
@@ -347,42 +575,41 @@ def get_comments_management_keyboard(confession_id):
     ])
 
 def get_channel_post_keyboard(confession_id):
-    url = f"https://t.me/{BOT_USERNAME}?start=discuss_{confession_id}"
     return InlineKeyboardMarkup([[
-        InlineKeyboardButton("💬 Comment & Discuss", url=url)
+        InlineKeyboardButton("💬 Comment & Discuss", url=DEEP_LINK_PREFIX + str(confession_id))
     ]])
 
 # --- Helper Functions (Your original functions, assumed correct) ---
 
+# Translation table for legacy Markdown (parse_mode='Markdown'), built once at import.
+# Only these four characters are special there; escaping anything else leaves a
+# literal backslash in the rendered message.
+_MARKDOWN_ESCAPE_TABLE = str.maketrans({char: f'\\{char}' for char in '_*`['})
+
 def escape_markdown_text(text):
-    escape_chars = r'_*[]()`>#+-.!|{}=~-'
-    for char in escape_chars:
-        text = text.replace(char, f'\\{char}')
-    return text
-
-def format_channel_post(confession_id, category, confession_text):
-    safe_confession_text = escape_markdown_text(confession_text)
-    comments_count = db.get_comments_count(confession_id)
-    
-    return (
-        f"*Confession #{confession_id}*\n\n"
-        f"{safe_confession_text}\n\n"
-        f"*Category:* {category}\n"
-        f"*Comments:* 💬 {comments_count}\n\n"
-        f"_Click below to join the discussion!_ 👇"
+    return text.translate(_MARKDOWN_ESCAPE_TABLE)
+
+# Formatters are pure functions of their arguments (the comment count included), so
+# repeat renders of a popular confession reuse the same string
+@functools.lru_cache(maxsize=4096)
+def format_channel_post(confession_id, category, confession_text, comments_count=0):
+    return CHANNEL_POST_TEMPLATE.format(
+        confession_id=confession_id,
+        text=escape_markdown_text(confession_text),
+        category=category,
+        comments_count=comments_count
     )
 
+@functools.lru_cache(maxsize=4096)
 def format_confession_full(confession_data, index, total):
-    # Data: (id, text, formatted_category, timestamp)
-    confession_id, text, category, timestamp = confession_data
+    # Data: (id, text, formatted_category, epoch_seconds, comments_count)
+    confession_id, text, category, timestamp, comments_count = confession_data
     
-    try:
-        dt = datetime.fromisoformat(timestamp)
-        date_str = dt.strftime("%b %d, %Y at %H:%M")
-    except (ValueError, TypeError):
+    # time.gmtime(None) would silently mean "now", so a missing timestamp is handled first
+    if timestamp is None:
         date_str = "recently"
-        
-    comments_count = db.get_comments_count(confession_id)
+    else:
+        date_str = time.strftime("%b %d, %Y at %H:%M", time.gmtime(timestamp))
     
     return (
         f"📝 *Confession #{confession_id}* ({index}/{total})\n\n"
@@ -391,7 +618,7 @@ def format_confession_full(confession_data, index, total):
         f"💬 *{comments_count} comments* • Join the discussion below!"
     )
 
-def format_discussion_welcome(confession_id, confession_data):
+def format_discussion_welcome(confession_id, confession_data, comments_count):
     # Data: (id, text, formatted_category, timestamp)
     confession_id, text, category, timestamp = confession_data
     
@@ -400,8 +627,6 @@ def format_discussion_welcome(confession_id, confession_data):
         date_str = dt.strftime("%b %d, %Y at %H:%M")
     except (ValueError, TypeError):
         date_str = "recently"
-        
-    comments_count = db.get_comments_count(confession_id)
     
     return (
         f"💬 *Discussion for Confession #{confession_id}*\n\n"
@@ -410,29 +635,86 @@ def format_discussion_welcome(confession_id, confession_data):
         f"🔍 *{comments_count} comments* • Share your thoughts below!"
     )
 
+# Keyed by minute (epoch // 60): a comment thread's neighbouring timestamps mostly
+# share a minute, so each label is formatted once
+@functools.lru_cache(maxsize=256)
+def _format_comment_minute(minute):
+    return time.strftime('%H:%M • %b %d', time.gmtime(minute * 60))
+
+def _format_comment(number, text, timestamp):
+    # Stored timestamps are UTC epoch seconds (see SQL_GET_COMMENTS)
+    time_str = "recently" if timestamp is None else _format_comment_minute(timestamp // 60)
+    # Use simple Anonymous #N naming for anonymity
+    return f"👤 *Anonymous #{number}* ({time_str}):\n» {escape_markdown_text(text)}\n"
+
 def format_comments_list(confession_id, comments_list):
     header = f"💬 *Comments for Confession #{confession_id}* ({len(comments_list)} total)\n\n"
     
     if not comments_list:
         return header + "No comments yet. Be the first to share your thoughts! 💭"
         
-    comment_blocks = []
-    
-    for i, (username, text, timestamp) in enumerate(comments_list):
-        safe_comment_text = escape_markdown_text(text)
-        # Use simple Anonymous #N naming for anonymity
-        anon_name = f"Anonymous #{i+1}" 
-        
-        time_str = ""
-        try:
-            dt = datetime.fromisoformat(timestamp.split('.')[0])
-            time_str = dt.strftime('%H:%M • %b %d')
-        except Exception:
-            time_str = "recently"
+    return header + "\n".join(
+        _format_comment(i, text, timestamp) for i, (text, timestamp) in enumerate(comments_list, 1)
+    )
 
-        comment_blocks.append(f"👤 *{anon_name}* ({time_str}):\n» {safe_comment_text}\n")
-            
-    return header + "\n".join(comment_blocks)
+# chat_id -> time.monotonic() until which Telegram has asked us to stop editing there
+_edit_backoff_until = {}
+# chat_id -> time.monotonic() at which the next edit in that chat may be sent
+_edit_next_slot = {}
+
+def edit_slot_delay(chat_id):
+    """Seconds until safe_edit_message may next edit a message in this chat (0 if now)."""
+    return max(_edit_next_slot.get(chat_id, 0) - time.monotonic(), 0)
+
+async def safe_edit_message(bot, chat_id, message_id, text, reply_markup=None, wait=False):
+    """Edit a Markdown message unless the chat is in a flood-control back-off.
+
+    Edits in the same chat are spaced EDIT_MIN_INTERVAL apart rather than letting
+    Telegram answer a burst with a long RetryAfter. An edit that arrives too early is
+    skipped, unless wait=True, which sleeps until the chat's next slot; that wait never
+    exceeds EDIT_MIN_INTERVAL. Handlers that can be pressed in rapid succession should
+    check edit_slot_delay first and tell the user to slow down. Only the browse view and
+    channel posts go through here, since those are the edits Prev/Next and the refresh
+    loop can repeat back to back; menu switches edit once per press and stay direct.
+    Returns True only once the edit has been sent. Returns False without raising when
+    the edit was skipped, rate-limited or timed out, so callers can retry later instead
+    of waiting out the limit inside a handler. Other Telegram errors propagate.
+    """
+    now = time.monotonic()
+    if now < _edit_backoff_until.get(chat_id, 0):
+        return False
+    delay = edit_slot_delay(chat_id)
+    if delay > 0:
+        if not wait:
+            return False
+        await asyncio.sleep(delay)
+    # Slots are only booked when an edit is actually sent, so the next one is never more
+    # than EDIT_MIN_INTERVAL away; re-inserting keeps active chats last for eviction
+    _edit_next_slot.pop(chat_id, None)
+    if len(_edit_next_slot) >= EDIT_LIMITER_SIZE:
+        del _edit_next_slot[next(iter(_edit_next_slot))]
+    _edit_next_slot[chat_id] = time.monotonic() + EDIT_MIN_INTERVAL
+    try:
+        await bot.edit_message_text(
+            chat_id=chat_id,
+            message_id=message_id,
+            text=text,
+            reply_markup=reply_markup,
+            parse_mode='Markdown'
+        )
+    except RetryAfter as e:
+        _edit_backoff_until[chat_id] = time.monotonic() + e.retry_after
+        logger.warning("Flood control in chat %s: pausing edits for %ss", chat_id, e.retry_after)
+        return False
+    except TimedOut:
+        logger.warning("Timed out editing message %s in chat %s", message_id, chat_id)
+        return False
+    _edit_backoff_until.pop(chat_id, None)
+    return True
+
+def clear_user_state(user_data, keys):
+    for key in keys:
+        user_data.pop(key, None)
 
 # --- Handler Functions (Your original functions) ---
 
@@ -441,23 +723,28 @@ async def start(update: Update, context: ContextTypes.DEFAULT_TYPE):
     
     # Check if it's a deep link from channel
     if context.args:
-        payload = context.args[0]
-        if payload.startswith('discuss_'):
+        deep_link = DEEP_LINK_PATTERN.match(context.args[0])
+        if deep_link:
             try:
-                confession_id = int(payload.split('_')[1])
-                confession = db.get_confession(confession_id)
+                confession_id = int(deep_link.group(1))
+                confession = await asyncio.to_thread(db.get_confession, confession_id)
                 
-                if confession and confession[6] == 'approved':
-                    # Confession data is (id, text, db_category, timestamp)
-                    confession_data = (confession[0], confession[4], CATEGORY_MAP.get(confession[3], confession[3]), confession[5]) 
+                if confession and confession['status'] == 'approved':
+                    # Confession data is (id, text, display_category, timestamp)
+                    confession_data = (
+                        confession['id'],
+                        confession['confession_text'],
+                        CATEGORY_MAP.get(confession['category'], confession['category']),
+                        confession['timestamp']
+                    )
                     await update.message.reply_text(
-                        format_discussion_welcome(confession_id, confession_data),
+                        format_discussion_welcome(confession_id, confession_data, confession['comments_count']),
                         parse_mode='Markdown',
-                        reply_markup=get_confession_discussion_keyboard(confession_id)
+                        reply_markup=get_confession_discussion_keyboard(confession_id, confession['comments_count'])
                     )
                     return BROWSING_CONFESSIONS
-            except (IndexError, ValueError, Exception) as e:
-                logger.error(f"Error handling deep link: {e}")
+            except Exception as e:
+                logger.error("Error handling deep link: %s", e)
     
     welcome_text = (
         "🤫 *Welcome to Confession Bot!*\n\n"
@@ -488,7 +775,7 @@ async def main_menu(update: Update, context: ContextTypes.DEFAULT_TYPE):
             reply_markup=get_main_keyboard()
         )
     except Exception as e:
-        logger.warning(f"main_menu edit failed: {e}")
+        logger.warning("main_menu edit failed: %s", e)
         
     return ConversationHandler.END
 
@@ -507,7 +794,7 @@ async def start_confession(update: Update, context: ContextTypes.DEFAULT_TYPE) -
     query = update.callback_query
     await query.answer()
     
-    context.user_data.clear()
+    clear_user_state(context.user_data, CONFESSION_STATE_KEYS)
     
     await query.edit_message_text(
         "📂 *Select a category for your confession:*\n\n"
@@ -522,32 +809,25 @@ async def select_category(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
     query = update.callback_query
     await query.answer()
     
-    key = query.data.replace("cat_", "")
+    key = context.match.group(1)
     # Save the database key (e.g., 'relationship')
     context.user_data['db_category'] = key 
-    # Use the display name for the prompt
-    display_category = CATEGORY_MAP.get(key, '🌟 Other')
+    # Unknown keys fall back to the "Other" prompt
+    prompt = _CATEGORY_PROMPTS.get(key, _CATEGORY_PROMPTS['general'])
     
-    await query.edit_message_text(
-        f"✅ *Category Selected:* {display_category}\n\n"
-        "📝 *Now write your confession:*\n\n"
-        "Please type your confession below:\n"
-        "• 10-1000 characters\n"
-        "• Be respectful\n"
-        "• No personal information\n\n"
-        "Your confession will be reviewed by admins before posting.",
-        parse_mode='Markdown'
-    )
+    await query.edit_message_text(prompt, parse_mode='Markdown')
     
     return WRITING_CONFESSION
 
 async def receive_confession(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
     user_id = update.effective_user.id
     username = update.effective_user.first_name or "Anonymous"
-    confession_text = update.message.text.strip()
+    raw_text = update.message.text
+    # Oversized pastes fail the length check anyway; skip copying them through strip()
+    confession_text = raw_text.strip() if len(raw_text) <= 1000 + LENGTH_CHECK_WHITESPACE_SLACK else raw_text
     # Get the database key
     db_category = context.user_data.get('db_category', 'general') 
-    display_category = CATEGORY_MAP.get(db_category, '🌟 Other')
+    display_category = CATEGORY_MAP.get(db_category, DEFAULT_CATEGORY_NAME)
 
     # Validation
     if not (10 <= len(confession_text) <= 1000):
@@ -558,34 +838,40 @@ async def receive_confession(update: Update, context: ContextTypes.DEFAULT_TYPE)
         return WRITING_CONFESSION
     
     # Save confession using the database key
-    confession_id = db.save_confession(user_id, username, db_category, confession_text)
+    confession_id = await asyncio.to_thread(db.save_confession, user_id, username, db_category, confession_text)
     
     if not confession_id:
         await update.message.reply_text("❌ *Error submitting confession.* Please try again later.", parse_mode='Markdown', reply_markup=get_main_keyboard())
-        context.user_data.clear()
+        clear_user_state(context.user_data, CONFESSION_STATE_KEYS)
         return ConversationHandler.END
 
     # Prepare admin notification
-    admin_message = (
-        f"🆕 *New Confession Pending Review* #{confession_id}\n\n"
-        f"👤 *User:* {username} (ID: {user_id})\n"
-        f"📂 *Category:* {display_category}\n"
-        f"📝 *Confession:* {escape_markdown_text(confession_text)}\n\n"
-        f"*Please review this confession:*"
+    admin_message = ADMIN_REVIEW_TEMPLATE.format(
+        confession_id=confession_id,
+        username=escape_markdown_text(username),
+        user_id=user_id,
+        category=display_category,
+        text=escape_markdown_text(confession_text)
     )
     
-    # Send to all admins
-    for admin_id in ADMIN_CHAT_IDS:
-        try:
-            await context.bot.send_message(
+    # Send to all admins concurrently; one failed admin must not block the others
+    admin_keyboard = get_admin_keyboard(confession_id)
+    results = await asyncio.gather(
+        *(
+            context.bot.send_message(
                 chat_id=admin_id,
                 text=admin_message,
-                reply_markup=get_admin_keyboard(confession_id), 
+                reply_markup=admin_keyboard,
                 parse_mode='Markdown',
                 disable_web_page_preview=True
             )
-        except Exception as e:
-            logger.error(f"Failed to send admin message to {admin_id}: {e}")
+            for admin_id in ADMIN_CHAT_IDS
+        ),
+        return_exceptions=True
+    )
+    for admin_id, result in zip(ADMIN_CHAT_IDS, results):
+        if isinstance(result, Exception):
+            logger.error("Failed to send admin message to %s: %s", admin_id, result)
             
     # Notify user
     await update.message.reply_text(
@@ -596,7 +882,7 @@ async def receive_confession(update: Update, context: ContextTypes.DEFAULT_TYPE)
         reply_markup=get_main_keyboard()
     )
         
-    context.user_data.clear()
+    clear_user_state(context.user_data, CONFESSION_STATE_KEYS)
     return ConversationHandler.END
 
 async def cancel_confession(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
@@ -607,36 +893,38 @@ async def cancel_confession(update: Update, context: ContextTypes.DEFAULT_TYPE)
         "❌ Confession cancelled.\n\nReturning to main menu.", 
         reply_markup=get_main_keyboard()
     )
-    context.user_data.clear()
+    clear_user_state(context.user_data, CONFESSION_STATE_KEYS)
     return ConversationHandler.END
 
 # --- Admin Functions (Your original functions) ---
 async def handle_admin_approval(update: Update, context: ContextTypes.DEFAULT_TYPE):
     query = update.callback_query
-    await query.answer()
     
-    user_id_str = str(query.from_user.id)
-    if user_id_str not in ADMIN_CHAT_IDS:
+    if query.from_user.id not in ADMIN_CHAT_IDS:
         await query.answer("❌ Only admins can perform this action.", show_alert=True)
         return
     
-    action, confession_id_str = query.data.split('_', 1) 
-    confession_id = int(confession_id_str)
+    # Acknowledge the button in the background so the spinner clears while the DB work runs
+    context.application.create_task(query.answer(), update=update)
     
-    confession = db.get_confession(confession_id)
-    if not confession:
+    action = context.match.group(1)
+    confession_id = int(context.match.group(2))
+    
+    confession = await asyncio.to_thread(db.get_confession, confession_id)
+    # Each admin has their own copy of the review buttons, so a second click must not re-post
+    if not confession or confession['status'] != 'pending':
         await query.edit_message_text(f"❌ Confession #{confession_id} not found or already processed.")
         return
     
-    # Unpack confession: (id, user_id, username, category_key, text, timestamp, status, channel_msg_id)
-    submitter_user_id = confession[1]
-    category_key = confession[3]
-    confession_text = confession[4]
-    display_category = CATEGORY_MAP.get(category_key, '🌟 Other')
+    submitter_user_id = confession['user_id']
+    category_key = confession['category']
+    confession_text = confession['confession_text']
+    display_category = CATEGORY_MAP.get(category_key, DEFAULT_CATEGORY_NAME)
     
     if action == 'approve':
         try:
             # Post to channel
+            # A confession awaiting approval cannot have comments yet, so the count is 0
             channel_text = format_channel_post(confession_id, display_category, confession_text)
             channel_message = await context.bot.send_message(
                 chat_id=CHANNEL_ID,
@@ -645,8 +933,15 @@ async def handle_admin_approval(update: Update, context: ContextTypes.DEFAULT_TY
                 parse_mode='Markdown'
             )
             
-            # Update database with new status and channel message ID
-            db.update_confession_status(confession_id, 'approved', channel_message.message_id)
+            # Update status and channel message ID in one statement; it only succeeds
+            # while the confession is still pending
+            approved = await asyncio.to_thread(db.approve_and_link, confession_id, channel_message.message_id)
+            if not approved:
+                # Another admin processed it while we were posting; withdraw the duplicate
+                await context.bot.delete_message(chat_id=CHANNEL_ID, message_id=channel_message.message_id)
+                await query.edit_message_text(f"❌ Confession #{confession_id} was already processed by another admin.")
+                return
+            invalidate_browse_cache(category_key)
             
             # Notify submitter
             user_message = "🎉 *Your Confession Has Been Approved!*"
@@ -655,15 +950,21 @@ async def handle_admin_approval(update: Update, context: ContextTypes.DEFAULT_TY
             try:
                 await context.bot.send_message(chat_id=submitter_user_id, text=user_message, parse_mode='Markdown')
             except Exception as e:
-                logger.warning(f"Could not notify user {submitter_user_id}: {e}")
+                logger.warning("Could not notify user %s: %s", submitter_user_id, e)
                 
         except Exception as e:
-            logger.error(f"Failed to post to channel: {e}")
-            await query.answer("❌ Failed to post to channel. Check bot permissions.", show_alert=True)
+            logger.error("Failed to post to channel: %s", e)
+            # The query is already answered, so report the failure in the admin chat instead
+            await query.message.reply_text("❌ Failed to post to channel. Check bot permissions.")
             return
             
     elif action == 'reject':
-        db.update_confession_status(confession_id, 'rejected')
+        # Like approval, only a still-pending confession can be rejected, so a stale or
+        # concurrent click never flips an already posted confession
+        rejected = await asyncio.to_thread(db.reject_pending, confession_id)
+        if not rejected:
+            await query.edit_message_text(f"❌ Confession #{confession_id} was already processed by another admin.")
+            return
         user_message = "❌ *Confession Not Approved*\n\nYour confession did not meet our guidelines."
         status_text = "REJECTED"
         status_emoji = "❌"
@@ -671,7 +972,7 @@ async def handle_admin_approval(update: Update, context: ContextTypes.DEFAULT_TY
         try:
             await context.bot.send_message(chat_id=submitter_user_id, text=user_message, parse_mode='Markdown')
         except Exception as e:
-            logger.warning(f"Could not notify user {submitter_user_id}: {e}")
+            logger.warning("Could not notify user %s: %s", submitter_user_id, e)
 
     # Update admin message
     await query.edit_message_text(
@@ -682,6 +983,52 @@ async def handle_admin_approval(update: Update, context: ContextTypes.DEFAULT_TY
     )
 
 # --- Browsing Logic ---
+# First browse page per category key (None = all categories), shared by every user.
+# Entries are (fetched_at, rows). When an approval or a new comment changes what the
+# page shows, the entry becomes an (invalidated_at, None) marker, so a fetch that was
+# already in flight cannot put the outdated page back.
+_browse_cache = {}
+
+async def get_first_browse_page(category):
+    """Return the first page of approved confessions for a category, cached for BROWSE_CACHE_TTL."""
+    started = time.monotonic()
+    cached = _browse_cache.get(category)
+    if cached and cached[1] is not None and started - cached[0] < BROWSE_CACHE_TTL:
+        return cached[1]
+    rows = tuple(await asyncio.to_thread(db.get_approved_confessions, category=category))
+    # Keep whatever was stored or invalidated after this fetch started
+    cached = _browse_cache.get(category)
+    if cached is None or cached[0] < started:
+        _browse_cache[category] = (started, rows)
+    return rows
+
+def invalidate_browse_cache(category):
+    """Drop the cached first pages that can list confessions of this category."""
+    now = time.monotonic()
+    _browse_cache[category] = (now, None)
+    _browse_cache[None] = (now, None)
+
+# Browse rows (id, text, db_category, epoch_seconds, comments_count) by confession id,
+# shared by every browsing user so each session only stores the ids it pages through.
+_browse_rows = {}
+
+def remember_browse_rows(rows):
+    for row in rows:
+        _browse_rows.pop(row[0], None)
+        if len(_browse_rows) >= BROWSE_ROW_CACHE_SIZE:
+            # Evict the oldest entry (dicts keep insertion order)
+            del _browse_rows[next(iter(_browse_rows))]
+        _browse_rows[row[0]] = row
+
+async def get_browse_row(confession_id):
+    """Return the browse row for an approved confession, loading it if it was evicted."""
+    row = _browse_rows.get(confession_id)
+    if row is None:
+        row = await asyncio.to_thread(db.get_approved_confession, confession_id)
+        if row:
+            remember_browse_rows((row,))
+    return row
+
 async def browse_menu(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
     browse_text = (
         "📚 *Browse Confessions*\n\n"
@@ -717,64 +1064,107 @@ async def browse_menu(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int
 
 async def display_confession(update: Update, context: ContextTypes.DEFAULT_TYPE, index: int):
     """Helper function to display a specific confession by index."""
-    confessions = context.user_data.get('confessions_list')
-    if not confessions:
+    confession_ids = context.user_data.get('confession_ids')
+    if not confession_ids:
         await update.effective_chat.send_message("❌ Browsing session expired. Please start browsing again.", reply_markup=get_browse_keyboard())
         return BROWSING_CONFESSIONS
         
-    total = len(confessions)
+    # Callers have already answered the callback query, so problems are reported by editing
+    # the message; browse_navigation handles the ends of the list before getting here
+    total = len(confession_ids)
     if not (0 <= index < total):
+        return
+
+    # Data is: (id, text, db_category, epoch_seconds, comments_count)
+    raw_data = await get_browse_row(confession_ids[index])
+    if raw_data is None:
+        # Count the vanished confession as seen so the next Prev/Next steps past it
+        context.user_data['current_index'] = index
         if update.callback_query:
-            await update.callback_query.answer("No more confessions in this category.", show_alert=True)
+            await update.callback_query.edit_message_text(
+                "❌ This confession is no longer available.",
+                reply_markup=get_browse_keyboard()
+            )
         return
 
-    context.user_data['current_index'] = index
-    
-    # Data is: (id, text, db_category, timestamp)
-    raw_data = confessions[index] 
-    
     # Convert DB category key to display name for formatting
-    display_category = CATEGORY_MAP.get(raw_data[2], '🌟 Other') 
-    confession_data = (raw_data[0], raw_data[1], display_category, raw_data[3])
+    display_category = CATEGORY_MAP.get(raw_data[2], DEFAULT_CATEGORY_NAME)
+    confession_data = (raw_data[0], raw_data[1], display_category, raw_data[3], raw_data[4])
     confession_id = raw_data[0]
     
-    formatted_text = format_confession_full(confession_data, index + 1, total)
-    keyboard = get_confession_browse_keyboard(confession_id, total, index + 1)
+    # The window may start after earlier-dropped ids and more pages may follow it, so
+    # positions are offset and the total is a lower bound until the last page
+    window_offset = context.user_data.get('window_offset', 0)
+    has_more = context.user_data.get('has_more_confessions', False)
+    total_label = f"{window_offset + total}+" if has_more else window_offset + total
+    formatted_text = format_confession_full(confession_data, window_offset + index + 1, total_label)
+    keyboard = get_confession_browse_keyboard(
+        confession_id, index > 0 or window_offset > 0, index + 1 < total or has_more, raw_data[4]
+    )
     
+    # current_index tracks the confession on screen, so each path below stores it only
+    # once this view has actually been shown; a skipped edit leaves Prev/Next relative
+    # to the confession the user is still looking at
     try:
         if update.callback_query:
-            await update.callback_query.edit_message_text(
-                formatted_text,
-                reply_markup=keyboard,
-                parse_mode='Markdown'
-            )
+            message = update.callback_query.message
+            # Re-pressing a button that would render the same view makes Telegram reject the
+            # edit with "message is not modified"; skip the round-trip instead. The keyboard
+            # check catches the message having been switched to another view in between.
+            render_signature = (message.message_id, hash(formatted_text))
+            if context.user_data.get('last_render') == render_signature and message.reply_markup == keyboard:
+                context.user_data['current_index'] = index
+                return
+            # A rate-limited edit is dropped rather than resent as a new message,
+            # which would only hit the same limit
+            if await safe_edit_message(
+                context.bot, message.chat_id, message.message_id, formatted_text, keyboard, wait=True
+            ):
+                context.user_data['current_index'] = index
+                context.user_data['last_render'] = render_signature
         else: # Used for deep links or initial command response if needed
              await update.message.reply_text(
                 formatted_text,
                 reply_markup=keyboard,
                 parse_mode='Markdown'
             )
-    except Exception as e:
-        logger.warning(f"Error displaying confession: {e}")
+             context.user_data['current_index'] = index
+    except BadRequest as e:
+        if 'not modified' in str(e).lower():
+            # A duplicate edit that slipped past the render signature; nothing to redo
+            logger.debug("Confession %s already displayed", confession_id)
+            context.user_data['current_index'] = index
+            return
+        logger.warning("Error displaying confession: %s", e)
         # Send as new message if edit fails (e.g., message too old)
         await update.effective_chat.send_message(
             formatted_text,
             reply_markup=keyboard,
             parse_mode='Markdown'
         )
+        context.user_data['current_index'] = index
 
 async def start_browse_category(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
     query = update.callback_query
-    await query.answer()
+    # Acknowledge the button in the background so the spinner clears while the DB work runs
+    context.application.create_task(query.answer(), update=update)
     
-    browse_key = query.data.replace("browse_", "") 
+    browse_key = context.match.group(1)
     display_category_name = CATEGORY_MAP.get(browse_key, "Latest") 
     
     # The key is passed to the DB manager (e.g., 'relationship' or 'recent')
-    confessions_raw = db.get_approved_confessions(category=browse_key if browse_key != "recent" else None, limit=50)
-
-    # Store list as (id, text, db_category, timestamp)
-    context.user_data['confessions_list'] = confessions_raw 
+    browse_category = browse_key if browse_key != "recent" else None
+    confessions_raw = await get_first_browse_page(browse_category)
+
+    # Keep only the ids per user; the rows live in the shared browse row cache.
+    # browse_navigation slides this window of ids as the user pages through.
+    remember_browse_rows(confessions_raw)
+    context.user_data['confession_ids'] = [row[0] for row in confessions_raw]
+    context.user_data['confessions_index_map'] = {row[0]: i for i, row in enumerate(confessions_raw)}
+    context.user_data['browse_category'] = browse_category
+    context.user_data['window_offset'] = 0
+    context.user_data['current_index'] = 0
+    context.user_data['has_more_confessions'] = len(confessions_raw) == BROWSE_PAGE_SIZE
     
     if not confessions_raw:
         await query.edit_message_text(
@@ -791,12 +1181,12 @@ async def start_browse_category(update: Update, context: ContextTypes.DEFAULT_TY
 
 async def browse_navigation(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
     query = update.callback_query
-    await query.answer()
     
-    confessions = context.user_data.get('confessions_list')
+    confession_ids = context.user_data.get('confession_ids')
     current_index = context.user_data.get('current_index', 0)
     
-    if not confessions:
+    if not confession_ids:
+        await query.answer()
         await query.edit_message_text(
             "Session expired. Please start browsing again.",
             reply_markup=get_browse_keyboard(),
@@ -804,50 +1194,105 @@ async def browse_navigation(update: Update, context: ContextTypes.DEFAULT_TYPE)
         )
         return BROWSING_CONFESSIONS
 
-    action = query.data.split('_')[0]
+    action = context.match.group(1)
+    # The confession on screen, so the index can follow it if the window slides
+    shown_id = confession_ids[current_index] if 0 <= current_index < len(confession_ids) else None
     
     new_index = current_index
     if action == 'next':
         new_index += 1
     elif action == 'prev':
         new_index -= 1
-    
+
+    window_offset = context.user_data.get('window_offset', 0)
+
+    # Pressing past either end (e.g. a double-tap on the last Next) changes nothing;
+    # answer with a toast instead of re-rendering the same confession
+    at_start = new_index < 0 and window_offset == 0
+    at_end = new_index >= len(confession_ids) and not context.user_data.get('has_more_confessions')
+    if at_start or at_end:
+        await query.answer("No more confessions in this category.")
+        return BROWSING_CONFESSIONS
+    if edit_slot_delay(query.message.chat_id) > 0:
+        # The previous page turn was under EDIT_MIN_INTERVAL ago; keep the current view
+        # rather than queue an edit Telegram would throttle
+        await query.answer("⏳ Slow down a little.")
+        return BROWSING_CONFESSIONS
+    await query.answer()
+
+    browse_category = context.user_data.get('browse_category')
+    if new_index == len(confession_ids):
+        # Reached the end of the loaded window: fetch the next page below the last loaded id
+        next_page = await asyncio.to_thread(
+            db.get_approved_confessions, category=browse_category, before_id=confession_ids[-1]
+        )
+        remember_browse_rows(next_page)
+        confession_ids.extend(row[0] for row in next_page)
+        context.user_data['has_more_confessions'] = len(next_page) == BROWSE_PAGE_SIZE
+        if not next_page:
+            # The previous page happened to end exactly at the last confession; re-render it
+            # so the total loses its "+" and the Next button disappears
+            new_index = current_index
+        # Slide the window forward, forgetting the oldest-viewed ids
+        overflow = len(confession_ids) - BROWSE_WINDOW_SIZE
+        if overflow > 0:
+            del confession_ids[:overflow]
+            window_offset += overflow
+            new_index -= overflow
+        context.user_data['window_offset'] = window_offset
+        context.user_data['confessions_index_map'] = {cid: i for i, cid in enumerate(confession_ids)}
+        # Re-anchor now to where the on-screen confession sits in the slid window:
+        # display_confession only moves the index once the new view is shown, and an
+        # index into the pre-slide window would be off by the shift
+        context.user_data['current_index'] = context.user_data['confessions_index_map'].get(shown_id, new_index)
+    elif new_index < 0:
+        # Stepped back past the start of the window: reload the page just above its first id
+        prev_page = await asyncio.to_thread(
+            db.get_newer_approved_confessions, category=browse_category, after_id=confession_ids[0]
+        )
+        remember_browse_rows(prev_page)
+        confession_ids[:0] = [row[0] for row in prev_page]
+        window_offset = max(window_offset - len(prev_page), 0)
+        new_index += len(prev_page)
+        if not prev_page:
+            # Nothing newer is left, so the window already starts at the newest confession
+            new_index = 0
+            window_offset = 0
+        # Slide the window back, forgetting the ids furthest ahead
+        if len(confession_ids) > BROWSE_WINDOW_SIZE:
+            del confession_ids[BROWSE_WINDOW_SIZE:]
+            context.user_data['has_more_confessions'] = True
+        context.user_data['window_offset'] = window_offset
+        context.user_data['confessions_index_map'] = {cid: i for i, cid in enumerate(confession_ids)}
+        context.user_data['current_index'] = context.user_data['confessions_index_map'].get(shown_id, new_index)
+
     await display_confession(update, context, index=new_index)
     return BROWSING_CONFESSIONS
 
 async def handle_back_to_confession(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
     query = update.callback_query
-    await query.answer()
+    # Acknowledge the button in the background so the spinner clears while the DB work runs
+    context.application.create_task(query.answer(), update=update)
     
-    try:
-        confession_id = int(query.data.split('_')[-1])
-    except:
-        await query.edit_message_text("❌ Invalid command. Returning to main menu.", reply_markup=get_main_keyboard())
-        return ConversationHandler.END
+    confession_id = int(context.match.group(1))
 
-    confessions = context.user_data.get('confessions_list', [])
-    index = -1
-    
-    for i, c in enumerate(confessions):
-        if c[0] == confession_id:
-            index = i
-            break
+    index = context.user_data.get('confessions_index_map', {}).get(confession_id)
 
-    if index != -1:
+    if index is not None:
         # If the confession is in the current browsing list, display it normally
         await display_confession(update, context, index=index)
     else:
         # Fallback for deep links or expired session
-        confession = db.get_confession(confession_id)
-        if confession and confession[6] == 'approved':
-            # Data: (id, text, db_category, timestamp)
-            display_category = CATEGORY_MAP.get(confession[3], confession[3])
-            confession_data = (confession[0], confession[4], display_category, confession[5])
+        confession = await asyncio.to_thread(db.get_confession, confession_id)
+        if confession and confession['status'] == 'approved':
+            # Data: (id, text, display_category, timestamp)
+            display_category = CATEGORY_MAP.get(confession['category'], confession['category'])
+            confession_data = (confession['id'], confession['confession_text'], display_category, confession['timestamp'])
             
-            formatted_text = format_discussion_welcome(confession_id, confession_data)
+            formatted_text = format_discussion_welcome(confession_id, confession_data, confession['comments_count'])
             await query.edit_message_text(
                 formatted_text,
-                reply_markup=get_confession_discussion_keyboard(confession_id),
+                reply_markup=get_confession_discussion_keyboard(confession_id, confession['comments_count']),
                 parse_mode='Markdown'
             )
         else:
@@ -860,22 +1305,49 @@ async def handle_back_to_confession(update: Update, context: ContextTypes.DEFAUL
     return BROWSING_CONFESSIONS
 
 # --- Comment Logic ---
+# confession_id -> (fetched_at, comments) for recently viewed threads. receive_comment
+# replaces the entry with an (invalidated_at, None) marker so a new comment is visible
+# immediately, even to a fetch that was already in flight when the comment was saved.
+_comments_cache = {}
+
+def _store_comments_entry(confession_id, entry):
+    _comments_cache.pop(confession_id, None)
+    if len(_comments_cache) >= COMMENTS_CACHE_SIZE:
+        # Evict the oldest entry (dicts keep insertion order)
+        del _comments_cache[next(iter(_comments_cache))]
+    _comments_cache[confession_id] = entry
+
+def invalidate_comments_cache(confession_id):
+    _store_comments_entry(confession_id, (time.monotonic(), None))
+
+async def get_cached_comments(confession_id):
+    """Return a confession's comments, reusing a fetch younger than COMMENTS_CACHE_TTL."""
+    started = time.monotonic()
+    cached = _comments_cache.get(confession_id)
+    if cached and cached[1] is not None and started - cached[0] < COMMENTS_CACHE_TTL:
+        return cached[1]
+    comments = await asyncio.to_thread(db.get_comments, confession_id)
+    # Keep whatever was stored or invalidated after this fetch started: a newer thread
+    # from a faster overlapping fetch, or the marker of a comment saved meanwhile
+    cached = _comments_cache.get(confession_id)
+    if cached is None or cached[0] < started:
+        _store_comments_entry(confession_id, (started, comments))
+    return comments
+
 async def start_add_comment(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
     query = update.callback_query
-    await query.answer()
+    # Acknowledge the button in the background so the spinner clears while the DB work runs
+    context.application.create_task(query.answer(), update=update)
     
-    try:
-        confession_id = int(query.data.split('_')[-1])
-    except:
-        await query.edit_message_text("❌ Invalid action. Returning to main menu.", reply_markup=get_main_keyboard())
-        return ConversationHandler.END
+    confession_id = int(context.match.group(1))
 
-    confession = db.get_confession(confession_id)
-    if not confession or confession[6] != 'approved':
+    confession = await asyncio.to_thread(db.get_confession, confession_id)
+    if not confession or confession['status'] != 'approved':
         await query.edit_message_text("❌ This confession is no longer available for comments.", reply_markup=get_browse_keyboard())
         return BROWSING_CONFESSIONS
         
     context.user_data['comment_confession_id'] = confession_id
+    context.user_data['comment_confession_category'] = confession['category']
     
     await query.edit_message_text(
         f"💬 *Confession #{confession_id}: Write Your Comment*\n\n"
@@ -889,12 +1361,12 @@ async def start_add_comment(update: Update, context: ContextTypes.DEFAULT_TYPE)
 async def receive_comment(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
     confession_id = context.user_data.get('comment_confession_id')
     user_id = update.effective_user.id
-    username = update.effective_user.first_name or "Anonymous"
-    comment_text = update.message.text.strip()
+    raw_text = update.message.text
+    comment_text = raw_text.strip() if len(raw_text) <= 500 + LENGTH_CHECK_WHITESPACE_SLACK else raw_text
 
     if not confession_id:
         await update.message.reply_text("❌ Comment session expired. Please start again from the confession.", reply_markup=get_main_keyboard())
-        context.user_data.clear()
+        clear_user_state(context.user_data, COMMENT_STATE_KEYS)
         return ConversationHandler.END
 
     # Validation
@@ -903,55 +1375,169 @@ async def receive_comment(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
         return WRITING_COMMENT
 
     # Save comment
-    comment_id = db.save_comment(confession_id, user_id, username, comment_text)
+    comments_count = await asyncio.to_thread(db.save_comment, confession_id, user_id, comment_text)
     
-    if comment_id:
+    if comments_count:
         await update.message.reply_text(
             f"✅ *Comment posted successfully!*\n\n"
             f"View all comments for Confession #{confession_id} below.",
-            reply_markup=get_comments_management_keyboard(confession_id),
+            reply_markup=get_comments_management_keyboard(confession_id, comments_count),
             parse_mode='Markdown'
         )
-        # TODO: Update the channel message comment count (Requires storing channel message ID and editing)
+        # The channel post's comment count is refreshed by the batched background loop
+        _pending_channel_refresh.add(confession_id)
+        # Cached browse pages and rows show comment counts too
+        invalidate_browse_cache(context.user_data.get('comment_confession_category'))
+        _browse_rows.pop(confession_id, None)
+        invalidate_comments_cache(confession_id)
 
     else:
         await update.message.reply_text("❌ Error saving comment. Please try again later.", reply_markup=get_main_keyboard())
     
-    if 'comment_confession_id' in context.user_data:
-        del context.user_data['comment_confession_id']
+    clear_user_state(context.user_data, COMMENT_STATE_KEYS)
     
     return BROWSING_CONFESSIONS
 
 async def view_comments(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
     query = update.callback_query
-    await query.answer()
+    # Acknowledge the button in the background so the spinner clears while the DB work runs
+    context.application.create_task(query.answer(), update=update)
     
-    try:
-        confession_id = int(query.data.split('_')[-1])
-    except:
-        await query.edit_message_text("❌ Invalid action. Returning to main menu.", reply_markup=get_main_keyboard())
-        return ConversationHandler.END
+    confession_id = int(context.match.group(1))
 
-    comments = db.get_comments(confession_id)
+    comments = await get_cached_comments(confession_id)
     formatted_comments = format_comments_list(confession_id, comments)
+    # The fetched list already gives the count, so the keyboard needs no extra lookup
+    keyboard = get_comments_management_keyboard(confession_id, len(comments))
     
     try:
         await query.edit_message_text(
             formatted_comments,
-            reply_markup=get_comments_management_keyboard(confession_id),
+            reply_markup=keyboard,
             parse_mode='Markdown'
         )
     except Exception as e:
-        logger.warning(f"View comments edit failed: {e}")
+        logger.warning("View comments edit failed: %s", e)
         # If edit fails, send a new message
         await query.message.reply_text(
             formatted_comments,
-            reply_markup=get_comments_management_keyboard(confession_id),
+            reply_markup=keyboard,
             parse_mode='Markdown'
         )
     
     return BROWSING_CONFESSIONS
 
+# --- Channel Post Refresh ---
+# Confessions whose channel post shows a stale comment count. A burst of comments on
+# one post collapses into a single edit per CHANNEL_REFRESH_INTERVAL, which keeps the
+# bot well inside Telegram's flood limits.
+_pending_channel_refresh = set()
+
+async def refresh_channel_posts(bot):
+    """Background loop that flushes queued comment-count edits to the channel."""
+    while True:
+        await asyncio.sleep(CHANNEL_REFRESH_INTERVAL)
+        if not _pending_channel_refresh:
+            continue
+
+        confession_ids = list(_pending_channel_refresh)
+        _pending_channel_refresh.clear()
+
+        for confession_id in confession_ids:
+            try:
+                confession = await asyncio.to_thread(db.get_confession, confession_id)
+                if not confession or confession['status'] != 'approved' or not confession['channel_message_id']:
+                    continue
+                display_category = CATEGORY_MAP.get(confession['category'], DEFAULT_CATEGORY_NAME)
+                edited = await safe_edit_message(
+                    bot,
+                    CHANNEL_ID,
+                    confession['channel_message_id'],
+                    format_channel_post(
+                        confession_id, display_category, confession['confession_text'], confession['comments_count']
+                    ),
+                    get_channel_post_keyboard(confession_id),
+                    wait=True
+                )
+                if not edited:
+                    # Rate-limited or timed out: keep it queued for a later pass
+                    _pending_channel_refresh.add(confession_id)
+            except Exception as e:
+                logger.warning("Could not refresh channel post for confession %s: %s", confession_id, e)
+
+async def post_init(application: Application) -> None:
+    """Start background tasks once the bot's event loop is running."""
+    application.bot_data['channel_refresh_task'] = asyncio.create_task(refresh_channel_posts(application.bot))
+
+async def post_shutdown(application: Application) -> None:
+    """Stop background tasks started in post_init."""
+    task = application.bot_data.pop('channel_refresh_task', None)
+    if task:
+        task.cancel()
+
+# --- Error Handling ---
+def summarize_update(update):
+    """Describe an update by the few fields needed to trace an error, without str(update)."""
+    if not isinstance(update, Update):
+        return repr(update)
+    chat = update.effective_chat
+    user = update.effective_user
+    callback_data = update.callback_query.data if update.callback_query else None
+    text = update.message.text[:200] if update.message and update.message.text else None
+    return (
+        f"update={update.update_id} chat={chat.id if chat else None} "
+        f"user={user.id if user else None} data={callback_data!r} text={text!r}"
+    )
+
+async def error_handler(update: object, context: ContextTypes.DEFAULT_TYPE) -> None:
+    # Walking the whole Update (str() or to_dict()) is costly exactly when errors pile up,
+    # so only a short summary is logged alongside the traceback
+    logger.error("Unhandled error for %s", summarize_update(update), exc_info=context.error)
+
+# --- Update Processing ---
+class PerChatUpdateProcessor(BaseUpdateProcessor):
+    """Processes updates from different chats concurrently, one at a time per chat.
+
+    A slow handler (e.g. the admin fan-out in receive_confession) only delays later
+    updates from the same chat, which also keeps ConversationHandler state consistent.
+    """
+
+    def __init__(self, max_concurrent_updates: int, max_pending_updates: int = MAX_PENDING_UPDATES):
+        # PTB takes its own slot before do_process_update runs, so an update waiting on its
+        # chat would hold one. That limit is set to the pending bound, and the real
+        # concurrency limit is a separate semaphore taken only once the chat lock is held,
+        # so a burst from one chat cannot fill every slot while other chats stall.
+        super().__init__(max_pending_updates)
+        self._handler_limit = max_concurrent_updates
+        self._handler_slots = None
+        # chat_id -> [lock, number of updates holding or waiting on it]
+        self._chat_locks = {}
+
+    async def do_process_update(self, update, coroutine) -> None:
+        chat = getattr(update, 'effective_chat', None)
+        if chat is None:
+            async with self._handler_slots:
+                await coroutine
+            return
+
+        entry = self._chat_locks.setdefault(chat.id, [asyncio.Lock(), 0])
+        entry[1] += 1
+        try:
+            async with entry[0]:
+                async with self._handler_slots:
+                    await coroutine
+        finally:
+            entry[1] -= 1
+            if entry[1] == 0:
+                del self._chat_locks[chat.id]
+
+    async def initialize(self) -> None:
+        # Created here so the semaphore belongs to the running event loop
+        self._handler_slots = asyncio.BoundedSemaphore(self._handler_limit)
+
+    async def shutdown(self) -> None:
+        pass
+
 # --- Main function setup ---
 def main() -> None:
     """Start the bot."""
@@ -965,20 +1551,30 @@ def main() -> None:
     keep_alive_thread.start()
 
     # 3. Create the Application
-    application = Application.builder().token(BOT_TOKEN).build()
+    application = (
+        Application.builder()
+        .token(BOT_TOKEN)
+        .post_init(post_init)
+        .post_shutdown(post_shutdown)
+        .concurrent_updates(PerChatUpdateProcessor(MAX_CONCURRENT_UPDATES))
+        .pool_timeout(TELEGRAM_POOL_TIMEOUT)
+        .connect_timeout(TELEGRAM_CONNECT_TIMEOUT)
+        .read_timeout(TELEGRAM_READ_TIMEOUT)
+        .build()
+    )
     
     # Conversation Handler for Confession Submission
     confession_handler = ConversationHandler(
-        entry_points=[CallbackQueryHandler(start_confession, pattern="^start_confess$")],
+        entry_points=[CallbackQueryHandler(start_confession, pattern=START_CONFESS_PATTERN)],
         states={
             SELECTING_CATEGORY: [
-                CallbackQueryHandler(select_category, pattern="^cat_"),
-                CallbackQueryHandler(cancel_confession, pattern="^cancel_confess$")
+                CallbackQueryHandler(select_category, pattern=CATEGORY_PATTERN),
+                CallbackQueryHandler(cancel_confession, pattern=CANCEL_CONFESS_PATTERN)
             ],
             WRITING_CONFESSION: [MessageHandler(filters.TEXT & ~filters.COMMAND, receive_confession)],
         },
         fallbacks=[
-            CallbackQueryHandler(main_menu, pattern="^main_menu$"),
+            CallbackQueryHandler(main_menu, pattern=MAIN_MENU_PATTERN),
         ]
     )
 
@@ -986,44 +1582,53 @@ def main() -> None:
     browsing_handler = ConversationHandler(
         entry_points=[
             CommandHandler("browse", browse_menu),
-            CallbackQueryHandler(browse_menu, pattern="^browse_menu$"),
+            CallbackQueryHandler(browse_menu, pattern=BROWSE_MENU_PATTERN),
             # Ensure /start handles deep links and transitions to BROWSING_CONFESSIONS if needed
             CommandHandler("start", start) 
         ],
         states={
             BROWSING_CONFESSIONS: [
-                CallbackQueryHandler(start_browse_category, pattern="^browse_"),
-                CallbackQueryHandler(browse_navigation, pattern="^(next|prev)_"),
-                CallbackQueryHandler(start_add_comment, pattern="^add_comment_"),
-                CallbackQueryHandler(view_comments, pattern="^view_comments_"),
-                CallbackQueryHandler(handle_back_to_confession, pattern="^back_to_confession_"),
-                CallbackQueryHandler(main_menu, pattern="^main_menu$"),
+                CallbackQueryHandler(browse_menu, pattern=BROWSE_MENU_PATTERN),
+                CallbackQueryHandler(start_browse_category, pattern=BROWSE_CATEGORY_PATTERN),
+                CallbackQueryHandler(browse_navigation, pattern=NAVIGATION_PATTERN),
+                CallbackQueryHandler(start_add_comment, pattern=ADD_COMMENT_PATTERN),
+                CallbackQueryHandler(view_comments, pattern=VIEW_COMMENTS_PATTERN),
+                CallbackQueryHandler(handle_back_to_confession, pattern=BACK_TO_CONFESSION_PATTERN),
+                CallbackQueryHandler(main_menu, pattern=MAIN_MENU_PATTERN),
             ],
             WRITING_COMMENT: [
                 MessageHandler(filters.TEXT & ~filters.COMMAND, receive_comment),
             ]
         },
         fallbacks=[
-            CallbackQueryHandler(main_menu, pattern="^main_menu$"),
+            CallbackQueryHandler(main_menu, pattern=MAIN_MENU_PATTERN),
         ]
     )
     
     # Main Handlers
     application.add_handler(CommandHandler("start", start)) # Re-added in case it's not a deep link
     application.add_handler(CommandHandler("help", help_info))
-    application.add_handler(CallbackQueryHandler(help_info, pattern="^help_info$"))
-    application.add_handler(CallbackQueryHandler(main_menu, pattern="^main_menu$"))
+    application.add_handler(CallbackQueryHandler(help_info, pattern=HELP_INFO_PATTERN))
+    application.add_handler(CallbackQueryHandler(main_menu, pattern=MAIN_MENU_PATTERN))
 
     # Admin Handler (Must be outside the ConversationHandlers)
-    application.add_handler(CallbackQueryHandler(handle_admin_approval, pattern="^(approve|reject)_"))
+    application.add_handler(CallbackQueryHandler(handle_admin_approval, pattern=ADMIN_ACTION_PATTERN))
 
     # Add the conversation handlers
     application.add_handler(confession_handler)
     application.add_handler(browsing_handler)
+
+    application.add_error_handler(error_handler)
     
     # Run the bot
     print("🤖 Starting Telegram Bot... Polling started.")
-    application.run_polling(allowed_updates=Update.ALL_TYPES)
+    # Long-poll getUpdates for up to POLLING_TIMEOUT seconds and only ask for the update
+    # types the handlers above consume
+    application.run_polling(
+        timeout=POLLING_TIMEOUT,
+        poll_interval=0.0,
+        allowed_updates=[Update.MESSAGE, Update.CALLBACK_QUERY]
+    )
 
 if __name__ == '__main__':
     main()